@@ -1,6 +1,8 @@
 """Renders GDB view of the Gecko CPU core"""
 
-from nalu import WaveformSearchMode
+import functools
+
+from nalu import WaveformSearchMode, disasm, render_gecko_registers
 
 from riscvmodel.insn import *
 
@@ -13,72 +15,152 @@ class MachineDecodeError(Exception):
         return "Invalid instruction word: {:08x}".format(self.word)
 
 
-def decode(word: int, variant: Variant = RV32I):
-    if word & 0x3 != 3:
-        # compact
-        for icls in get_insns(cls=InstructionCType):
-            if icls._match(word):
-                i = icls()
-                i.decode(word)
-                return i
-        raise MachineDecodeError(word)
-    opcode = word & 0x7F
-    for icls in get_insns(variant=variant):
-        if icls.field_opcode.value == opcode and icls.match(word):
+def _build_decode_table(insns, size):
+    table = [[] for _ in range(size)]
+    for icls in insns:
+        table[icls.field_opcode.value].append(icls)
+    return table
+
+
+# Instruction classes grouped by opcode, so decode only tries the candidates
+# that can possibly match
+_DECODE_COMPRESSED = _build_decode_table(get_insns(cls=InstructionCType), 4)
+_DECODE_BY_OPCODE = {RV32I: _build_decode_table(get_insns(variant=RV32I), 128)}
+
+
+def _get_decode_table(variant):
+    table = _DECODE_BY_OPCODE.get(variant)
+    if table is None:
+        table = _build_decode_table(get_insns(variant=variant), 128)
+        _DECODE_BY_OPCODE[variant] = table
+    return table
+
+
+def _decode_compressed(word, variant):
+    for icls in _DECODE_COMPRESSED[word & 0x3]:
+        if icls._match(word):
+            i = icls()
+            i.decode(word)
+            return i
+    return None
+
+
+def _decode_full(word, variant):
+    for icls in _get_decode_table(variant)[word & 0x7F]:
+        if icls.match(word):
             i = icls()
             i.decode(word)
             return i
-    raise MachineDecodeError(word)
+    return None
+
+
+# Indexed by the low two bits of the word, which select a compressed quadrant
+# or a full-width instruction
+_DISPATCH = (_decode_compressed, _decode_compressed, _decode_compressed, _decode_full)
+
+
+@functools.lru_cache(maxsize=4096)
+def _decode_cached(word, variant):
+    return _DISPATCH[word & 0x3](word, variant)
+
+
+def decode_safe(word: int, variant: Variant = RV32I):
+    """Decodes an instruction word, returning None if it is invalid
+
+    The instruction is shared through the decode cache and must not be modified
+    """
+    return _decode_cached(word, variant)
+
+
+def decode(word: int, variant: Variant = RV32I):
+    """Decodes an instruction word, raising MachineDecodeError if it is invalid
+
+    The instruction is shared through the decode cache and must not be modified
+    """
+    inst = _decode_cached(word, variant)
+    if inst is None:
+        raise MachineDecodeError(word)
+    return inst
+
+
+_HEX = tuple(f"{b:02x}" for b in range(256))
+
+
+def hex8(value):
+    """Formats a 32-bit value as 0x-prefixed, zero-padded hex"""
+    return (
+        "0x"
+        + _HEX[(value >> 24) & 0xFF]
+        + _HEX[(value >> 16) & 0xFF]
+        + _HEX[(value >> 8) & 0xFF]
+        + _HEX[value & 0xFF]
+    )
+
+
+_REG_NAMES = (
+    "x0",
+    "ra",
+    "sp",
+    "gp",
+    "tp",
+    "t0",
+    "t1",
+    "t2",
+    "s0",
+    "s1",
+    "a0",
+    "a1",
+    "a2",
+    "a3",
+    "a4",
+    "a5",
+    "a6",
+    "a7",
+    "s2",
+    "s3",
+    "s4",
+    "s5",
+    "s6",
+    "s7",
+    "s8",
+    "s9",
+    "s10",
+    "s11",
+    "t3",
+    "t4",
+    "t5",
+    "t6",
+)
 
 
 def get_reg_name(reg_num):
-    reg_name = [
-        "x0",
-        "ra",
-        "sp",
-        "gp",
-        "tp",
-        "t0",
-        "t1",
-        "t2",
-        "s0",
-        "s1",
-        "a0",
-        "a1",
-        "a2",
-        "a3",
-        "a4",
-        "a5",
-        "a6",
-        "a7",
-        "s2",
-        "s3",
-        "s4",
-        "s5",
-        "s6",
-        "s7",
-        "s8",
-        "s9",
-        "s10",
-        "s11",
-        "t3",
-        "t4",
-        "t5",
-        "t6",
-    ]
-    return reg_name[reg_num]
+    return _REG_NAMES[reg_num]
+
+
+_REG_PATH = tuple(
+    f"TOP.gecko_nano_wrapper.inst.core.gecko_decode_inst.regfile.register_file_inst.xilinx_distributed_ram_inst.data[{reg_num}]"
+    for reg_num in range(32)
+)
+_REG_STATUS_FRONT_PATH = tuple(
+    f"TOP.gecko_nano_wrapper.inst.core.gecko_decode_inst.regfile.register_status_front_inst.xilinx_distributed_ram_inst.data[{reg_num}]"
+    for reg_num in range(32)
+)
+_REG_STATUS_REAR_PATH = tuple(
+    f"TOP.gecko_nano_wrapper.inst.core.gecko_decode_inst.regfile.register_status_rear_inst.xilinx_distributed_ram_inst.data[{reg_num}]"
+    for reg_num in range(32)
+)
 
 
 def get_reg_path(reg_num):
-    return f"TOP.gecko_nano_wrapper.inst.core.gecko_decode_inst.regfile.register_file_inst.xilinx_distributed_ram_inst.data[{reg_num}]"
+    return _REG_PATH[reg_num]
 
 
 def get_reg_status_front_path(reg_num):
-    return f"TOP.gecko_nano_wrapper.inst.core.gecko_decode_inst.regfile.register_status_front_inst.xilinx_distributed_ram_inst.data[{reg_num}]"
+    return _REG_STATUS_FRONT_PATH[reg_num]
 
 
 def get_reg_status_rear_path(reg_num):
-    return f"TOP.gecko_nano_wrapper.inst.core.gecko_decode_inst.regfile.register_status_rear_inst.xilinx_distributed_ram_inst.data[{reg_num}]"
+    return _REG_STATUS_REAR_PATH[reg_num]
 
 
 def get_pc_path():
@@ -89,51 +171,85 @@ def get_mem_path(addr):
     return f"TOP.gecko_nano_wrapper.inst.mem.gen_xilinx.xilinx_block_ram_double_inst.data[{addr}]"
 
 
+# Idcodes resolved from the VCD header, kept across redraws
+_IDCODE_HEADER = None
+_REG_IDCODES = None
+_PC_IDCODE = None
+_MEM_IDCODES = {}
+
+
+def _check_idcode_cache(vcd_header):
+    global _IDCODE_HEADER, _REG_IDCODES, _PC_IDCODE, _MEM_IDCODES
+    if vcd_header is not _IDCODE_HEADER:
+        _IDCODE_HEADER = vcd_header
+        _REG_IDCODES = None
+        _PC_IDCODE = None
+        _MEM_IDCODES = {}
+
+
+def _ensure_reg_idcodes(vcd_header):
+    """Returns (data, front, rear) idcodes for each register"""
+    global _REG_IDCODES
+    _check_idcode_cache(vcd_header)
+    if _REG_IDCODES is None:
+        _REG_IDCODES = [
+            (
+                vcd_header.get_variable(get_reg_path(reg)).get_idcode(),
+                vcd_header.get_variable(get_reg_status_front_path(reg)).get_idcode(),
+                vcd_header.get_variable(get_reg_status_rear_path(reg)).get_idcode(),
+            )
+            for reg in range(32)
+        ]
+    return _REG_IDCODES
+
+
+def _get_pc_idcode(vcd_header):
+    global _PC_IDCODE
+    _check_idcode_cache(vcd_header)
+    if _PC_IDCODE is None:
+        _PC_IDCODE = vcd_header.get_variable(get_pc_path()).get_idcode()
+    return _PC_IDCODE
+
+
+def _get_mem_idcode(vcd_header, addr):
+    _check_idcode_cache(vcd_header)
+    idcode = _MEM_IDCODES.get(addr)
+    if idcode is None:
+        idcode = vcd_header.get_variable(get_mem_path(addr)).get_idcode()
+        _MEM_IDCODES[addr] = idcode
+    return idcode
+
+
 def get_reg_info(waveform, vcd_header, buffer, timestamp_index, line=0):
-    for reg in range(32):
-        # Find register signal
-        signal = vcd_header.get_variable(get_reg_path(reg))
-        result = waveform.search_value(signal.get_idcode(), timestamp_index)
-        reg_value = result.get_vector().get_value()
-        # Find front register status signal
-        signal = vcd_header.get_variable(get_reg_status_front_path(reg))
-        result = waveform.search_value(signal.get_idcode(), timestamp_index)
-        reg_status_front_value = result.get_vector().get_value()
-        # Find rear register status signal
-        signal = vcd_header.get_variable(get_reg_status_rear_path(reg))
-        result = waveform.search_value(signal.get_idcode(), timestamp_index)
-        reg_status_rear_value = result.get_vector().get_value()
-        # Format register message
-        reg_num = f"x{reg}".ljust(3)
-        reg_value = "0x{:08x}".format(reg_value)
-        reg_status = (reg_status_front_value - reg_status_rear_value) & 0x7
-        info = f"{reg_num} ({get_reg_name(reg).ljust(3)}) {reg_value} ({reg_status})"
-        # Find screen offsets
-        header = "--Registers"
-        for x in range(buffer.get_width()):
-            if x < len(header):
-                buffer.set_cell(x, line, header[x])
-            else:
-                buffer.set_cell(x, line, "-")
-        x = (reg // 8) * 32
-        y = reg % 8
-        for i, char in enumerate(info):
-            buffer.set_cell(x + i, y + line + 1, char)
+    render_gecko_registers(
+        buffer, waveform, _ensure_reg_idcodes(vcd_header), timestamp_index, line
+    )
+
+
+# Last (word, text) rendered, adjacent memory words are often identical
+# padding or NOPs
+_last_decoded = (None, "")
+
+
+def _format_instruction(word):
+    global _last_decoded
+    if word == _last_decoded[0]:
+        return _last_decoded[1]
+    text = disasm(word) or "<unknown>"
+    _last_decoded = (word, text)
+    return text
 
 
 def get_instruction_info(waveform, vcd_header, buffer, timestamp_index, line=0):
     # Find pc signal
-    signal = vcd_header.get_variable(get_pc_path())
-    result = waveform.search_value(signal.get_idcode(), timestamp_index)
+    result = waveform.search_value(_get_pc_idcode(vcd_header), timestamp_index)
     pc_value = result.get_vector().get_value()
 
     # Find screen offsets
-    header = "--Instructions"
-    for x in range(buffer.get_width()):
-        if x < len(header):
-            buffer.set_cell(x, line, header[x])
-        else:
-            buffer.set_cell(x, line, "-")
+    width = buffer.get_width()
+    header = b"--Instructions"
+    buffer.set_text_ascii(0, line, header)
+    buffer.fill_row(len(header), line, max(width - len(header), 0), "-")
 
     for i, offset in enumerate(range(-3, 4)):
         pc_offset = pc_value + offset
@@ -141,38 +257,49 @@ def get_instruction_info(waveform, vcd_header, buffer, timestamp_index, line=0):
             continue
 
         # Find memory signal
-        signal = vcd_header.get_variable(get_mem_path(pc_offset))
-        result = waveform.search_value(signal.get_idcode(), timestamp_index)
+        idcode = _get_mem_idcode(vcd_header, pc_offset)
+        result = waveform.search_value(idcode, timestamp_index)
         mem_value = result.get_vector().get_value()
 
         header = ">" if offset == 0 else "-"
-        try:
-            inst = decode(mem_value)
-        except:
-            inst = "<unknown>"
-        mem_value = "0x{:08x}".format(mem_value)
-        pc_offset = "0x{:08x}".format(pc_offset)
-        info = f"{header}{pc_offset} ({mem_value}) {str(inst)}"
-        for j, char in enumerate(info):
-            buffer.set_cell(j, line + i + 1, char)
+        inst = _format_instruction(mem_value)
+        mem_value = hex8(mem_value)
+        pc_offset = hex8(pc_offset)
+        info = f"{header}{pc_offset} ({mem_value}) {inst}"
+        buffer.set_text(0, line + i + 1, info)
+
+
+# Last (key, buffer) rendered, reused while the cursor stays within the same
+# timestamp and the view is unchanged
+_last_frame = None
 
 
 def main(buffer, waveform, vcd_header, cursor):
     """Main function"""
+    global _last_frame
 
     timestamp_index = waveform.search_timestamp(cursor, int(WaveformSearchMode.Before))
     if timestamp_index is None:
         raise Exception("Timestamp index not found!")
 
-    for i, c in enumerate(
-        f"Timestamp:       {str(waveform.get_timestamp(timestamp_index))}"
-    ):
-        buffer.set_cell(i, 1, c)
-    for i, c in enumerate(f"Timestamp Index: {str(timestamp_index)}"):
-        buffer.set_cell(i, 2, c)
+    frame_key = (
+        waveform,
+        vcd_header,
+        timestamp_index,
+        buffer.get_width(),
+        buffer.get_height(),
+    )
+    if _last_frame is not None and _last_frame[0] == frame_key:
+        return _last_frame[1]
+
+    buffer.set_text(
+        0, 1, f"Timestamp:       {str(waveform.get_timestamp(timestamp_index))}"
+    )
+    buffer.set_text(0, 2, f"Timestamp Index: {str(timestamp_index)}")
 
     get_reg_info(waveform, vcd_header, buffer, timestamp_index, line=8)
 
     get_instruction_info(waveform, vcd_header, buffer, timestamp_index, line=20)
 
+    _last_frame = (frame_key, buffer)
     return buffer
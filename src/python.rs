@@ -1,4 +1,6 @@
 pub mod bitvector;
 pub mod buffer;
+pub mod gecko;
+pub mod riscv;
 pub mod vcd_header;
 pub mod waveform;
@@ -12,6 +12,19 @@ pub enum LogicPy {
     HighImpedance = 3,
 }
 
+/// Converts the lower 64 bits of a bitvector with the same logic mapping as
+/// `BitVector.get_value()`
+pub fn bitvector_to_u64(bitvector: &BitVector) -> u64 {
+    let mut value = 0;
+    for index in 0..bitvector.get_bit_width().min(64) {
+        match bitvector.get_bit(index) {
+            Logic::Zero | Logic::Unknown => {}
+            Logic::One | Logic::HighImpedance => value |= 1 << index,
+        }
+    }
+    value
+}
+
 #[derive(Clone, Debug, PartialEq)]
 #[pyclass]
 pub struct BitVectorPy {
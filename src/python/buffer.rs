@@ -1,3 +1,4 @@
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 
 #[derive(Clone, Debug, PartialEq, Eq)]
@@ -31,6 +32,33 @@ impl BufferPy {
         }
     }
 
+    pub fn set_text(&mut self, x: u16, y: u16, text: &str) {
+        if y < self.height {
+            let row = (y * self.width) as usize;
+            for (x, c) in (x..self.width).zip(text.chars()) {
+                self.buffer[row + x as usize] = c;
+            }
+        }
+    }
+
+    /// Writes ASCII text, each byte is taken as a single character
+    pub fn set_text_ascii(&mut self, x: u16, y: u16, text: &[u8]) {
+        if y < self.height {
+            let row = (y * self.width) as usize;
+            for (x, b) in (x..self.width).zip(text) {
+                self.buffer[row + x as usize] = *b as char;
+            }
+        }
+    }
+
+    pub fn fill_row(&mut self, x: u16, y: u16, len: u16, c: char) {
+        if x < self.width && y < self.height {
+            let start = (y * self.width + x) as usize;
+            let end = start + len.min(self.width - x) as usize;
+            self.buffer[start..end].fill(c);
+        }
+    }
+
     pub fn get_width(&self) -> u16 {
         self.width
     }
@@ -53,6 +81,38 @@ impl BufferPy {
         Ok(())
     }
 
+    #[pyo3(name = "set_text")]
+    fn set_text_py(mut self_: PyRefMut<'_, Self>, x: u16, y: u16, text: &str) -> PyResult<()> {
+        self_.set_text(x, y, text);
+        Ok(())
+    }
+
+    #[pyo3(name = "set_text_ascii")]
+    fn set_text_ascii_py(
+        mut self_: PyRefMut<'_, Self>,
+        x: u16,
+        y: u16,
+        text: &[u8],
+    ) -> PyResult<()> {
+        if !text.is_ascii() {
+            return Err(PyValueError::new_err("Text is not ASCII"));
+        }
+        self_.set_text_ascii(x, y, text);
+        Ok(())
+    }
+
+    #[pyo3(name = "fill_row")]
+    fn fill_row_py(
+        mut self_: PyRefMut<'_, Self>,
+        x: u16,
+        y: u16,
+        len: u16,
+        c: char,
+    ) -> PyResult<()> {
+        self_.fill_row(x, y, len, c);
+        Ok(())
+    }
+
     #[pyo3(name = "get_width")]
     fn get_width_py(self_: PyRef<'_, Self>) -> PyResult<u16> {
         Ok(self_.get_width())
@@ -63,3 +123,63 @@ impl BufferPy {
         Ok(self_.get_height())
     }
 }
+
+#[cfg(test)]
+fn buffer_row(buffer: &BufferPy, y: u16) -> String {
+    (0..buffer.get_width())
+        .map(|x| buffer.get_cell(x, y))
+        .collect()
+}
+
+#[test]
+fn buffer_set_text_test() {
+    let mut buffer = BufferPy::new(8, 2);
+    buffer.set_text(2, 0, "abc");
+    assert_eq!(buffer_row(&buffer, 0), "  abc   ");
+    // Text longer than the rest of the row is clipped, not wrapped
+    buffer.set_text(5, 0, "defghi");
+    assert_eq!(buffer_row(&buffer, 0), "  abcdef");
+    assert_eq!(buffer_row(&buffer, 1), "        ");
+    // Writes starting past the right or bottom edge are ignored
+    buffer.set_text(8, 0, "x");
+    buffer.set_text(0, 2, "x");
+    assert_eq!(buffer_row(&buffer, 0), "  abcdef");
+    assert_eq!(buffer_row(&buffer, 1), "        ");
+}
+
+#[test]
+fn buffer_fill_row_test() {
+    let mut buffer = BufferPy::new(8, 2);
+    buffer.fill_row(2, 0, 3, '-');
+    assert_eq!(buffer_row(&buffer, 0), "  ---   ");
+    // Fills running past the end of the row are clipped, not wrapped
+    buffer.fill_row(6, 0, 100, '=');
+    assert_eq!(buffer_row(&buffer, 0), "  --- ==");
+    assert_eq!(buffer_row(&buffer, 1), "        ");
+    // Fills starting past the right or bottom edge, or of zero length, are
+    // ignored
+    buffer.fill_row(8, 0, 1, 'x');
+    buffer.fill_row(0, 2, 8, 'x');
+    buffer.fill_row(0, 1, 0, 'x');
+    assert_eq!(buffer_row(&buffer, 0), "  --- ==");
+    assert_eq!(buffer_row(&buffer, 1), "        ");
+}
+
+#[test]
+fn buffer_set_text_ascii_test() {
+    let mut buffer = BufferPy::new(8, 2);
+    buffer.set_text_ascii(5, 0, b"abcdef");
+    assert_eq!(buffer_row(&buffer, 0), "     abc");
+    assert_eq!(buffer_row(&buffer, 1), "        ");
+
+    // Non-ASCII bytes are rejected without touching the buffer
+    Python::with_gil(|py| {
+        let buffer = PyCell::new(py, BufferPy::new(8, 2)).unwrap();
+        let err =
+            BufferPy::set_text_ascii_py(buffer.borrow_mut(), 0, 0, "é".as_bytes()).unwrap_err();
+        assert!(err.is_instance_of::<PyValueError>(py));
+        assert_eq!(buffer_row(&buffer.borrow(), 0), "        ");
+        BufferPy::set_text_ascii_py(buffer.borrow_mut(), 0, 0, b"ok").unwrap();
+        assert_eq!(buffer_row(&buffer.borrow(), 0), "ok      ");
+    });
+}
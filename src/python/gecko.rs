@@ -0,0 +1,51 @@
+use pyo3::exceptions::{PyKeyError, PyValueError};
+use pyo3::prelude::*;
+
+use crate::python::{buffer::BufferPy, riscv::REG_NAMES, waveform::WaveformPy};
+
+/// Renders the Gecko register table starting at `line`, reading each register
+/// from its (data, front status, rear status) idcodes as resolved by the script
+#[pyfunction]
+#[pyo3(name = "render_gecko_registers")]
+pub fn render_gecko_registers_py(
+    mut buffer: PyRefMut<'_, BufferPy>,
+    waveform: PyRef<'_, WaveformPy>,
+    reg_idcodes: Vec<(usize, usize, usize)>,
+    timestamp_index: usize,
+    line: u16,
+) -> PyResult<()> {
+    if reg_idcodes.len() != REG_NAMES.len() {
+        return Err(PyValueError::new_err(format!(
+            "Expected {} register idcodes, got {}",
+            REG_NAMES.len(),
+            reg_idcodes.len()
+        )));
+    }
+    let get_value = |idcode: usize| {
+        waveform
+            .search_value_u64(idcode, timestamp_index)
+            .ok_or_else(|| PyKeyError::new_err(format!("Signal has no value: {idcode}")))
+    };
+
+    let header = b"--Registers";
+    let header_width = header.len() as u16;
+    let fill_width = buffer.get_width().saturating_sub(header_width);
+    buffer.set_text_ascii(0, line, header);
+    buffer.fill_row(header_width, line, fill_width, '-');
+    for (reg, (reg_name, (data_idcode, front_idcode, rear_idcode))) in
+        REG_NAMES.iter().zip(reg_idcodes).enumerate()
+    {
+        let reg_value = get_value(data_idcode)?;
+        // Only the low three bits of the status pointers matter, so the
+        // difference is taken on bytes
+        let reg_status_front_value = get_value(front_idcode)? as u8;
+        let reg_status_rear_value = get_value(rear_idcode)? as u8;
+        let reg_status = reg_status_front_value.wrapping_sub(reg_status_rear_value) & 0x7;
+        let reg_num = format!("x{reg}");
+        let info = format!("{reg_num:<3} ({reg_name:<3}) 0x{reg_value:08x} ({reg_status})");
+        let x = (reg / 8) * 32;
+        let y = reg % 8;
+        buffer.set_text(x as u16, line + 1 + y as u16, &info);
+    }
+    Ok(())
+}
@@ -0,0 +1,187 @@
+use pyo3::prelude::*;
+
+/// ABI names of the integer registers
+pub const REG_NAMES: [&str; 32] = [
+    "x0", "ra", "sp", "gp", "tp", "t0", "t1", "t2", "s0", "s1", "a0", "a1", "a2", "a3", "a4", "a5",
+    "a6", "a7", "s2", "s3", "s4", "s5", "s6", "s7", "s8", "s9", "s10", "s11", "t3", "t4", "t5",
+    "t6",
+];
+
+fn reg(index: u32) -> &'static str {
+    REG_NAMES[(index & 0x1F) as usize]
+}
+
+fn imm_i(word: u32) -> i32 {
+    (word as i32) >> 20
+}
+
+fn imm_s(word: u32) -> i32 {
+    ((word as i32) >> 25) << 5 | ((word >> 7) & 0x1F) as i32
+}
+
+fn imm_b(word: u32) -> i32 {
+    ((word as i32) >> 31) << 12
+        | (((word >> 7) & 0x1) << 11) as i32
+        | (((word >> 25) & 0x3F) << 5) as i32
+        | (((word >> 8) & 0xF) << 1) as i32
+}
+
+fn imm_j(word: u32) -> i32 {
+    ((word as i32) >> 31) << 20
+        | (word & 0xFF000) as i32
+        | (((word >> 20) & 0x1) << 11) as i32
+        | (((word >> 21) & 0x3FF) << 1) as i32
+}
+
+/// Disassembles a 32-bit RV32I instruction word, returning None if the word
+/// is not a valid RV32I instruction
+pub fn disasm(word: u32) -> Option<String> {
+    let rd = reg(word >> 7);
+    let rs1 = reg(word >> 15);
+    let rs2 = reg(word >> 20);
+    let funct3 = (word >> 12) & 0x7;
+    let funct7 = word >> 25;
+    let inst = match word & 0x7F {
+        0x37 => format!("lui {rd}, 0x{:x}", word >> 12),
+        0x17 => format!("auipc {rd}, 0x{:x}", word >> 12),
+        0x6F => format!("jal {rd}, {}", imm_j(word)),
+        0x67 if funct3 == 0 => format!("jalr {rd}, {}({rs1})", imm_i(word)),
+        0x63 => {
+            let mnemonic = match funct3 {
+                0 => "beq",
+                1 => "bne",
+                4 => "blt",
+                5 => "bge",
+                6 => "bltu",
+                7 => "bgeu",
+                _ => return None,
+            };
+            format!("{mnemonic} {rs1}, {rs2}, {}", imm_b(word))
+        }
+        0x03 => {
+            let mnemonic = match funct3 {
+                0 => "lb",
+                1 => "lh",
+                2 => "lw",
+                4 => "lbu",
+                5 => "lhu",
+                _ => return None,
+            };
+            format!("{mnemonic} {rd}, {}({rs1})", imm_i(word))
+        }
+        0x23 => {
+            let mnemonic = match funct3 {
+                0 => "sb",
+                1 => "sh",
+                2 => "sw",
+                _ => return None,
+            };
+            format!("{mnemonic} {rs2}, {}({rs1})", imm_s(word))
+        }
+        0x13 => {
+            let shamt = (word >> 20) & 0x1F;
+            match (funct3, funct7) {
+                (0, _) => format!("addi {rd}, {rs1}, {}", imm_i(word)),
+                (2, _) => format!("slti {rd}, {rs1}, {}", imm_i(word)),
+                (3, _) => format!("sltiu {rd}, {rs1}, {}", imm_i(word)),
+                (4, _) => format!("xori {rd}, {rs1}, {}", imm_i(word)),
+                (6, _) => format!("ori {rd}, {rs1}, {}", imm_i(word)),
+                (7, _) => format!("andi {rd}, {rs1}, {}", imm_i(word)),
+                (1, 0x00) => format!("slli {rd}, {rs1}, {shamt}"),
+                (5, 0x00) => format!("srli {rd}, {rs1}, {shamt}"),
+                (5, 0x20) => format!("srai {rd}, {rs1}, {shamt}"),
+                _ => return None,
+            }
+        }
+        0x33 => {
+            let mnemonic = match (funct3, funct7) {
+                (0, 0x00) => "add",
+                (0, 0x20) => "sub",
+                (1, 0x00) => "sll",
+                (2, 0x00) => "slt",
+                (3, 0x00) => "sltu",
+                (4, 0x00) => "xor",
+                (5, 0x00) => "srl",
+                (5, 0x20) => "sra",
+                (6, 0x00) => "or",
+                (7, 0x00) => "and",
+                _ => return None,
+            };
+            format!("{mnemonic} {rd}, {rs1}, {rs2}")
+        }
+        0x0F => match funct3 {
+            0 => String::from("fence"),
+            1 => String::from("fence.i"),
+            _ => return None,
+        },
+        0x73 => {
+            let csr = word >> 20;
+            let zimm = (word >> 15) & 0x1F;
+            match funct3 {
+                0 if word == 0x0000_0073 => String::from("ecall"),
+                0 if word == 0x0010_0073 => String::from("ebreak"),
+                1 => format!("csrrw {rd}, 0x{csr:03x}, {rs1}"),
+                2 => format!("csrrs {rd}, 0x{csr:03x}, {rs1}"),
+                3 => format!("csrrc {rd}, 0x{csr:03x}, {rs1}"),
+                5 => format!("csrrwi {rd}, 0x{csr:03x}, {zimm}"),
+                6 => format!("csrrsi {rd}, 0x{csr:03x}, {zimm}"),
+                7 => format!("csrrci {rd}, 0x{csr:03x}, {zimm}"),
+                _ => return None,
+            }
+        }
+        _ => return None,
+    };
+    Some(inst)
+}
+
+#[pyfunction]
+#[pyo3(name = "disasm")]
+pub fn disasm_py(word: u32) -> PyResult<Option<String>> {
+    Ok(disasm(word))
+}
+
+#[test]
+fn disasm_test() {
+    for (word, expected) in [
+        // I-type
+        (0xff010113, "addi sp, sp, -16"),
+        (0x00c12503, "lw a0, 12(sp)"),
+        (0x00008067, "jalr x0, 0(ra)"),
+        // S-type
+        (0xfe812e23, "sw s0, -4(sp)"),
+        // B-type
+        (0xfe050ee3, "beq a0, x0, -4"),
+        (0x7e62ffe3, "bgeu t0, t1, 4094"),
+        // U-type
+        (0xfffff537, "lui a0, 0xfffff"),
+        (0x12345197, "auipc gp, 0x12345"),
+        // J-type
+        (0xffdff0ef, "jal ra, -4"),
+        (0x7ff0006f, "jal x0, 4094"),
+        (0x8000006f, "jal x0, -1048576"),
+        // R-type
+        (0x40c58533, "sub a0, a1, a2"),
+        (0x407352b3, "sra t0, t1, t2"),
+        // Shifts
+        (0x40355513, "srai a0, a0, 3"),
+        (0x01f59513, "slli a0, a1, 31"),
+        // CSR
+        (0x30029073, "csrrw x0, 0x300, t0"),
+        (0x3412d573, "csrrwi a0, 0x341, 5"),
+        // Fence and system
+        (0x0ff0000f, "fence"),
+        (0x0000100f, "fence.i"),
+        (0x00000073, "ecall"),
+        (0x00100073, "ebreak"),
+    ] {
+        assert_eq!(disasm(word).as_deref(), Some(expected), "{word:08x}");
+    }
+
+    // Zero, all ones, srli with a bad funct7, ld (RV64), mul (M extension)
+    // and a compressed word
+    for word in [
+        0x00000000, 0xffffffff, 0x20155513, 0x00003503, 0x02a50533, 0x00004501,
+    ] {
+        assert_eq!(disasm(word), None, "{word:08x}");
+    }
+}
@@ -4,7 +4,7 @@ use pyo3::prelude::*;
 
 use makai_waveform_db::{Waveform, WaveformSearchMode, WaveformValueResult};
 
-use crate::python::bitvector::BitVectorPy;
+use crate::python::bitvector::{bitvector_to_u64, BitVectorPy};
 
 #[derive(Clone, Debug, PartialEq, Eq)]
 #[pyclass(name = "WaveformSearchMode")]
@@ -78,6 +78,22 @@ impl WaveformPy {
     pub fn new(waveform: Arc<Waveform>) -> Self {
         Self { waveform }
     }
+
+    pub fn get_timestamp(&self, timestamp_index: usize) -> Option<u64> {
+        self.waveform.get_timestamps().get(timestamp_index).copied()
+    }
+
+    pub fn search_value_u64(&self, idcode: usize, timestamp_index: usize) -> Option<u64> {
+        match self.waveform.search_value_bit_index(
+            idcode,
+            timestamp_index,
+            WaveformSearchMode::Before,
+            None,
+        )? {
+            WaveformValueResult::Vector(value, _) => Some(bitvector_to_u64(&value)),
+            WaveformValueResult::Real(_, _) => None,
+        }
+    }
 }
 
 #[pymethods]
@@ -90,11 +106,7 @@ impl WaveformPy {
 
     #[pyo3(name = "get_timestamp")]
     fn get_timestamp_py(self_: PyRef<'_, Self>, timestamp_index: usize) -> PyResult<Option<u64>> {
-        Ok(self_
-            .waveform
-            .get_timestamps()
-            .get(timestamp_index)
-            .copied())
+        Ok(self_.get_timestamp(timestamp_index))
     }
 
     #[pyo3(name = "search_timestamp")]
@@ -130,4 +142,44 @@ impl WaveformPy {
             Ok(None)
         }
     }
+
+    #[pyo3(name = "search_values")]
+    fn search_values_py(
+        self_: PyRef<'_, Self>,
+        idcodes: Vec<usize>,
+        timestamp_index: usize,
+    ) -> PyResult<Vec<Option<WaveformValueResultPy>>> {
+        Ok(idcodes
+            .into_iter()
+            .map(|idcode| {
+                self_
+                    .waveform
+                    .search_value_bit_index(
+                        idcode,
+                        timestamp_index,
+                        WaveformSearchMode::Before,
+                        None,
+                    )
+                    .map(WaveformValueResultPy::new)
+            })
+            .collect())
+    }
+
+    #[pyo3(name = "read_register_triplet")]
+    fn read_register_triplet_py(
+        self_: PyRef<'_, Self>,
+        idcode_data: usize,
+        idcode_front: usize,
+        idcode_rear: usize,
+        timestamp_index: usize,
+    ) -> PyResult<Option<(u64, u64, u64)>> {
+        let (Some(data), Some(front), Some(rear)) = (
+            self_.search_value_u64(idcode_data, timestamp_index),
+            self_.search_value_u64(idcode_front, timestamp_index),
+            self_.search_value_u64(idcode_rear, timestamp_index),
+        ) else {
+            return Ok(None);
+        };
+        Ok(Some((data, front, rear)))
+    }
 }
@@ -1,10 +1,12 @@
-use std::path::PathBuf;
+use std::path::{Path, PathBuf};
 use std::sync::Arc;
+use std::time::SystemTime;
 
 use crossterm::event::{KeyCode, KeyEvent, MouseEventKind};
 use makai::utils::messages::Messages;
 use makai_vcd_reader::parser::VcdHeader;
 use makai_waveform_db::Waveform;
+use pyo3::prelude::*;
 use tui::{
     buffer::Buffer,
     layout::Rect,
@@ -15,6 +17,7 @@ use tui::{
 use tui_tiling::component::ComponentWidget;
 
 use crate::{
+    python::{buffer::*, gecko::*, riscv::*, vcd_header::*, waveform::*},
     state::signal_viewer::SignalViewerEntry,
     state::signal_viewer::SignalViewerMessage,
     widgets::timescale::{Timescale, TimescaleState},
@@ -26,6 +29,53 @@ pub(crate) enum WaveformViewerMessage {
     UpdateWaveform(Arc<Waveform>, Arc<VcdHeader>, i32, Option<PathBuf>),
 }
 
+/// Python script and wrapper objects kept alive across redraws so that any
+/// state the script caches at module level survives until the waveform or the
+/// script itself is reloaded
+struct PythonContext {
+    modified: Option<SystemTime>,
+    main: Py<PyAny>,
+    waveform: Py<WaveformPy>,
+    vcd_header: Py<VcdHeaderPy>,
+}
+
+impl PythonContext {
+    fn load(
+        py: Python<'_>,
+        python_path: &Path,
+        modified: Option<SystemTime>,
+        waveform: &Arc<Waveform>,
+        vcd_header: &Arc<VcdHeader>,
+    ) -> PyResult<Self> {
+        let nalu = PyModule::new(py, "nalu")?;
+        nalu.add_class::<WaveformSearchModePy>()?;
+        nalu.add_function(wrap_pyfunction!(render_gecko_registers_py, nalu)?)?;
+        nalu.add_function(wrap_pyfunction!(disasm_py, nalu)?)?;
+        py.import("sys")?
+            .getattr("modules")?
+            .set_item("nalu", nalu)?;
+
+        let python_bytes = std::fs::read(python_path)?;
+        let python_file = String::from_utf8_lossy(&python_bytes);
+        let main: Py<PyAny> = PyModule::from_code(py, &python_file, "", "")?
+            .getattr("main")?
+            .into();
+
+        Ok(Self {
+            modified,
+            main,
+            waveform: Py::new(py, WaveformPy::new(waveform.clone()))?,
+            vcd_header: Py::new(py, VcdHeaderPy::new(vcd_header.clone()))?,
+        })
+    }
+}
+
+fn get_modified(path: &Path) -> Option<SystemTime> {
+    std::fs::metadata(path)
+        .and_then(|metadata| metadata.modified())
+        .ok()
+}
+
 pub struct WaveformViewerState {
     width: usize,
     height: usize,
@@ -35,6 +85,7 @@ pub struct WaveformViewerState {
     signal_entries: Vec<Option<SignalViewerEntry>>,
     python_view: bool,
     python_path: Option<PathBuf>,
+    python_context: Option<PythonContext>,
     messages: Messages,
 }
 
@@ -49,6 +100,7 @@ impl WaveformViewerState {
             signal_entries: Vec::new(),
             python_view: false,
             python_path: None,
+            python_context: None,
             messages,
         }
     }
@@ -66,6 +118,7 @@ impl WaveformViewerState {
         self.timescale_state
             .load_waveform(range.clone(), range.end, timescale);
         self.python_path = python_path;
+        self.python_context = None;
     }
 
     pub fn set_size(&mut self, size: &Rect, border_width: u16) {
@@ -102,32 +155,42 @@ impl WaveformViewerState {
         }
     }
 
-    fn get_python_widget(&self) -> Paragraph<'_> {
-        use crate::python::{buffer::*, vcd_header::*, waveform::*};
-        use pyo3::prelude::*;
-
+    fn get_python_widget(&mut self) -> Paragraph<'_> {
         let Some(python_path) = self.python_path.clone() else {
             return Paragraph::new("No python loaded!");
         };
 
         let result: PyResult<BufferPy> = Python::with_gil(|py| {
-            let nalu = PyModule::new(py, "nalu")?;
-            nalu.add_class::<crate::python::waveform::WaveformSearchModePy>()?;
-            py.import("sys")?
-                .getattr("modules")?
-                .set_item("nalu", nalu)?;
-
-            let python_bytes = std::fs::read(python_path)?;
-            let python_file = String::from_utf8_lossy(&python_bytes);
-            let main: Py<PyAny> = PyModule::from_code(py, &python_file, "", "")?
-                .getattr("main")?
-                .into();
+            // Reload the script whenever it is edited on disk
+            let modified = get_modified(&python_path);
+            if self
+                .python_context
+                .as_ref()
+                .map_or(true, |context| context.modified != modified)
+            {
+                self.python_context = Some(PythonContext::load(
+                    py,
+                    &python_path,
+                    modified,
+                    &self.waveform,
+                    &self.vcd_header,
+                )?);
+            }
+            let context = self.python_context.as_ref().unwrap();
 
             let buffer = BufferPy::new(self.width as u16, self.height as u16);
-            let waveform = WaveformPy::new(self.waveform.clone());
-            let vcd_header = VcdHeaderPy::new(self.vcd_header.clone());
             let cursor = self.timescale_state.get_cursor();
-            main.call1(py, (buffer, waveform, vcd_header, cursor))?
+            context
+                .main
+                .call1(
+                    py,
+                    (
+                        buffer,
+                        context.waveform.clone_ref(py),
+                        context.vcd_header.clone_ref(py),
+                        cursor,
+                    ),
+                )?
                 .extract::<BufferPy>(py)
         });
 